@@ -12,8 +12,8 @@ What you get (all-in-one):
   - Reservation create/modify/cancel
   - Compressed menu data (short names; expands only on request)
 
-Run:
-  pip install fastapi uvicorn pydantic
+Run (Python 3.10+):
+  pip install fastapi uvicorn pydantic orjson
   python app.py
 Then open:
   http://127.0.0.1:8000
@@ -24,13 +24,16 @@ Production note:
 
 from __future__ import annotations
 
+import re
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import datetime, timedelta, time, date
-from typing import Dict, List, Optional, Any
+from typing import Container, Dict, List, Optional, Any, Set, Tuple
 
 from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from pydantic import BaseModel
 import uvicorn
 
@@ -49,7 +52,7 @@ MENU = {
 # -----------------------------
 # Models
 # -----------------------------
-@dataclass
+@dataclass(slots=True)
 class Reservation:
     reservation_id: str
     name: str
@@ -64,32 +67,47 @@ class Reservation:
         return datetime.combine(self.reservation_date, self.reservation_time)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SlotSchedule:
     open_time: time
     close_time: time
     slot_minutes: int = 30
     turn_minutes: int = 90
-
-    def slots_for_date(self, d: date) -> List[time]:
-        start_dt = datetime.combine(d, self.open_time)
-        end_latest_start = datetime.combine(d, self.close_time) - timedelta(minutes=self.turn_minutes)
+    # Derived grid, built once; frozen so it cannot drift from the fields above.
+    slot_times: Tuple[time, ...] = field(init=False, repr=False, compare=False)
+    turn_slots: int = field(init=False, repr=False, compare=False)
+    _slot_index: Dict[time, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Slot times are a pure time-of-day grid, so build them once per schedule.
+        anchor = date(2000, 1, 1)
+        start_dt = datetime.combine(anchor, self.open_time)
+        end_latest_start = datetime.combine(anchor, self.close_time) - timedelta(minutes=self.turn_minutes)
         slots: List[time] = []
         cur = start_dt
         while cur <= end_latest_start:
             slots.append(cur.time().replace(second=0, microsecond=0))
             cur += timedelta(minutes=self.slot_minutes)
-        return slots
+        object.__setattr__(self, "slot_times", tuple(slots))
+        object.__setattr__(self, "_slot_index", {t: i for i, t in enumerate(slots)})
+        # Number of consecutive grid slots a single booking occupies.
+        object.__setattr__(self, "turn_slots", -(-self.turn_minutes // self.slot_minutes))
+
+    def slot_index(self, t: time) -> Optional[int]:
+        return self._slot_index.get(t)
+
+    def slots_for_date(self, d: date) -> Tuple[time, ...]:
+        return self.slot_times
 
 
-@dataclass
+@dataclass(slots=True)
 class RestaurantConfig:
     name: str = "Dining Reservation Chatbot"
     total_seats: int = 40
     schedule: SlotSchedule = field(default_factory=lambda: SlotSchedule(open_time=time(12, 0), close_time=time(23, 0)))
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionState:
     name: Optional[str] = None
     phone: Optional[str] = None
@@ -103,67 +121,132 @@ class ReservationEngine:
     def __init__(self, config: RestaurantConfig):
         self.config = config
         self.reservations: Dict[str, Reservation] = {}
-        self._cache: Dict[date, Dict[time, int]] = {}
+        # Per-date seats used, stored as a list parallel to the schedule's slot grid.
+        self._cache: Dict[date, List[int]] = {}
+        # Bumped on every booking change for a date; keys derived caches.
+        self._version: Dict[date, int] = {}
+        # Secondary index so cache rebuilds only touch that date's bookings.
+        self._by_date: Dict[date, Set[str]] = {}
+        # Per date and party size: bit i set iff a booking can start at slot i.
+        self._cap_bits: Dict[date, Dict[int, int]] = {}
+        # Formatted availability per (date, party_size, version); per engine so
+        # separate engines never share results.
+        self._labels_cache = lru_cache(maxsize=1024)(self._labels_for)
 
     def _invalidate(self, d: date) -> None:
+        # Drop the stale list; the rebuild happens lazily on the next read.
+        self._version[d] = self._version.get(d, 0) + 1
         self._cache.pop(d, None)
+        self._cap_bits.pop(d, None)
+
+    def version(self, d: date) -> int:
+        return self._version.get(d, 0)
+
+    def _index(self, r: Reservation) -> None:
+        self._by_date.setdefault(r.reservation_date, set()).add(r.reservation_id)
 
-    def _occupied_slots(self, r: Reservation) -> List[time]:
+    def _unindex(self, r: Reservation) -> None:
+        ids = self._by_date.get(r.reservation_date)
+        if ids is not None:
+            ids.discard(r.reservation_id)
+            if not ids:
+                del self._by_date[r.reservation_date]
+
+    def _occupied_slots(self, r: Reservation) -> range:
+        # Slot indices covered by r's turn; bookings always start on the grid.
         sched = self.config.schedule
-        start_dt = r.dt
-        end_dt = start_dt + timedelta(minutes=sched.turn_minutes)
-        slots = []
-        cur = start_dt
-        while cur < end_dt:
-            slots.append(cur.time().replace(second=0, microsecond=0))
-            cur += timedelta(minutes=sched.slot_minutes)
-        return slots
+        start = sched.slot_index(r.reservation_time)
+        if start is None:
+            return range(0)
+        return range(start, min(start + sched.turn_slots, len(sched.slot_times)))
 
     def _build_cache(self, d: date) -> None:
-        used = {s: 0 for s in self.config.schedule.slots_for_date(d)}
-        for r in self.reservations.values():
-            if r.reservation_date != d:
-                continue
-            for s in self._occupied_slots(r):
-                if s in used:
-                    used[s] += r.party_size
+        reservations = self.reservations
+        used = [0] * len(self.config.schedule.slot_times)
+        for rid in self._by_date.get(d, ()):
+            r = reservations[rid]
+            party = r.party_size
+            for i in self._occupied_slots(r):
+                used[i] += party
         self._cache[d] = used
+        self._cap_bits.pop(d, None)
 
-    def _can_fit(self, d: date, start_t: time, party_size: int, ignore_id: Optional[str] = None) -> bool:
-        slots_set = set(self.config.schedule.slots_for_date(d))
-        if start_t not in slots_set:
-            return False
-
+    def _used(self, d: date) -> List[int]:
         if d not in self._cache:
             self._build_cache(d)
+        return self._cache[d]
 
-        used = dict(self._cache[d])
-
-        if ignore_id and ignore_id in self.reservations:
-            old = self.reservations[ignore_id]
-            if old.reservation_date == d:
-                for s in self._occupied_slots(old):
-                    if s in used:
-                        used[s] -= old.party_size
-
-        sched = self.config.schedule
-        start_dt = datetime.combine(d, start_t)
-        end_dt = start_dt + timedelta(minutes=sched.turn_minutes)
-
-        cur = start_dt
-        while cur < end_dt:
-            s = cur.time().replace(second=0, microsecond=0)
-            if s not in slots_set:
-                return False
-            if used.get(s, 0) + party_size > self.config.total_seats:
+    def _fits_at(self, used: List[int], i: int, party_size: int, released: Container[int] = range(0), released_seats: int = 0) -> bool:
+        # A booking starting at slot i needs every slot of its turn to exist and have room.
+        # Slots in `released` are read as if released_seats had been given back.
+        k = self.config.schedule.turn_slots
+        if i + k > len(used):
+            return False
+        cap = self.config.total_seats - party_size
+        for j in range(i, i + k):
+            seats = used[j] - (released_seats if j in released else 0)
+            if seats > cap:
                 return False
-            cur += timedelta(minutes=sched.slot_minutes)
-
         return True
 
+    def _can_fit(self, d: date, start_t: time, party_size: int, ignore_id: Optional[str] = None) -> bool:
+        start_i = self.config.schedule.slot_index(start_t)
+        if start_i is None:
+            return False
+
+        released: Container[int] = range(0)
+        released_seats = 0
+        old = self.reservations.get(ignore_id) if ignore_id else None
+        if old is not None and old.reservation_date == d:
+            released = self._occupied_slots(old)
+            released_seats = old.party_size
+
+        if not released_seats:
+            return bool(self._start_mask(d, party_size) >> start_i & 1)
+        return self._fits_at(self._used(d), start_i, party_size, released, released_seats)
+
+    def _start_mask(self, d: date, party_size: int) -> int:
+        # guests comes from the client; only cache 1..total_seats so the
+        # per-date mask table stays bounded.
+        if party_size > self.config.total_seats:
+            return 0
+        used = self._used(d)
+        masks = self._cap_bits.setdefault(d, {})
+        mask = masks.get(party_size)
+        if mask is None:
+            k = self.config.schedule.turn_slots
+            cap = self.config.total_seats - party_size
+            room = 0
+            for i, seats in enumerate(used):
+                if seats <= cap:
+                    room |= 1 << i
+            # A start needs room in all k slots of its turn: AND the room bits
+            # shifted down by 0..k-1. Shifting also clears starts whose turn
+            # would run past the end of the grid.
+            mask = room
+            for j in range(1, k):
+                mask &= room >> j
+            if party_size >= 1:
+                masks[party_size] = mask
+        return mask
+
     def availability(self, d: date, party_size: int) -> List[time]:
         slots = self.config.schedule.slots_for_date(d)
-        return [s for s in slots if self._can_fit(d, s, party_size)]
+        mask = self._start_mask(d, party_size)
+        out: List[time] = []
+        append = out.append
+        while mask:
+            low = mask & -mask
+            append(slots[low.bit_length() - 1])
+            mask ^= low
+        return out
+
+    def _labels_for(self, d: date, party_size: int, version: int) -> Tuple[str, ...]:
+        # version only keys the cache: any booking change on d forces a fresh lookup.
+        return tuple(fmt_time(t) for t in self.availability(d, party_size))
+
+    def availability_labels(self, d: date, party_size: int) -> List[str]:
+        return list(self._labels_cache(d, party_size, self.version(d)))
 
     def create(self, name: str, phone: Optional[str], party_size: int, d: date, t: time) -> Reservation:
         if not self._can_fit(d, t, party_size):
@@ -171,13 +254,14 @@ class ReservationEngine:
         rid = "R-" + uuid.uuid4().hex[:10].upper()
         r = Reservation(rid, name, phone, party_size, d, t)
         self.reservations[rid] = r
+        self._index(r)
         self._invalidate(d)
         return r
 
     def modify(self, rid: str, *, party_size: Optional[int] = None, d: Optional[date] = None, t: Optional[time] = None) -> Reservation:
-        if rid not in self.reservations:
+        r = self.reservations.get(rid)
+        if r is None:
             raise KeyError("Not found.")
-        r = self.reservations[rid]
         new_party = party_size if party_size is not None else r.party_size
         new_d = d if d is not None else r.reservation_date
         new_t = t if t is not None else r.reservation_time
@@ -186,17 +270,20 @@ class ReservationEngine:
             raise ValueError("Slot unavailable.")
 
         old_d = r.reservation_date
+        self._unindex(r)
         r.party_size = new_party
         r.reservation_date = new_d
         r.reservation_time = new_t
+        self._index(r)
         self._invalidate(old_d)
         self._invalidate(new_d)
         return r
 
     def cancel(self, rid: str) -> Reservation:
-        if rid not in self.reservations:
+        r = self.reservations.pop(rid, None)
+        if r is None:
             raise KeyError("Not found.")
-        r = self.reservations.pop(rid)
+        self._unindex(r)
         self._invalidate(r.reservation_date)
         return r
 
@@ -207,6 +294,7 @@ class ReservationEngine:
 # -----------------------------
 # Helpers
 # -----------------------------
+@lru_cache(maxsize=256)
 def fmt_time(t: time) -> str:
     h = t.hour
     suffix = "AM" if h < 12 else "PM"
@@ -216,12 +304,14 @@ def fmt_time(t: time) -> str:
     return f"{hh}:{t.minute:02d} {suffix}"
 
 
+@lru_cache(maxsize=512)
 def parse_date_iso(s: Optional[str]) -> Optional[date]:
     if not s:
         return None
     return date.fromisoformat(s)
 
 
+@lru_cache(maxsize=512)
 def parse_time_hhmm(s: Optional[str]) -> Optional[time]:
     if not s:
         return None
@@ -229,7 +319,7 @@ def parse_time_hhmm(s: Optional[str]) -> Optional[time]:
     return time(int(hh), int(mm))
 
 
-def menu_response(details: bool) -> str:
+def _render_menu(details: bool) -> str:
     lines = ["Menu"]
     for cat, items in MENU.items():
         if details:
@@ -241,6 +331,15 @@ def menu_response(details: bool) -> str:
     return "\n".join(lines)
 
 
+# MENU is static, so both variants are rendered once at import.
+_MENU_SHORT = _render_menu(False)
+_MENU_DETAIL = _render_menu(True)
+
+
+def menu_response(details: bool) -> str:
+    return _MENU_DETAIL if details else _MENU_SHORT
+
+
 def reservation_summary(r: Reservation, heading: str = "Reservation confirmed.") -> str:
     return (
         f"{heading}\n"
@@ -266,9 +365,11 @@ def serialize_reservation(r: Reservation) -> Dict[str, Any]:
 # -----------------------------
 # App
 # -----------------------------
-app = FastAPI(title="Dining Reservation Chatbot (Single File)", version="1.0")
+app = FastAPI(title="Dining Reservation Chatbot (Single File)", version="1.0", default_response_class=ORJSONResponse)
 engine = ReservationEngine(RestaurantConfig())
-sessions: Dict[str, SessionState] = {}
+# Sessions are keyed by client-chosen ids, so keep only the most recent ones.
+MAX_SESSIONS = 10_000
+sessions: OrderedDict[str, SessionState] = OrderedDict()
 
 
 class ChatRequest(BaseModel):
@@ -294,10 +395,44 @@ class ChatResponse(BaseModel):
     active_reservation: Optional[Dict[str, Any]] = None
 
 
+def _reply(reply: str, **fields: Any) -> ChatResponse:
+    # Replies are built from our own typed values; skip pydantic validation.
+    return ChatResponse.model_construct(reply=reply, **fields)
+
+
 def get_session(sid: str) -> SessionState:
-    if sid not in sessions:
-        sessions[sid] = SessionState()
-    return sessions[sid]
+    s = sessions.get(sid)
+    if s is not None:
+        sessions.move_to_end(sid)
+        return s
+    s = sessions[sid] = SessionState()
+    if len(sessions) > MAX_SESSIONS:
+        sessions.popitem(last=False)
+    return s
+
+
+# Chat fallback intents: one precompiled alternation with a named group per
+# intent. INTENT_REPLIES is in priority order; the first intent found wins.
+# Non-greeting intents match their stem anywhere in a word, like the original
+# substring checks (cancelling, rebook, unavailable, exchange); greetings need a
+# whole word so "this" and "they" do not count.
+_MENU_DETAIL_RE = re.compile(r"details|description|ingredients")
+_INTENT_RE = re.compile(
+    r"(?P<greet>\b(?:hi|hello|hey)\b)"
+    r"|\b(?:"
+    r"(?P<avail>\w*availab\w*)"
+    r"|(?P<book>\w*(?:book|reserv)\w*)"
+    r"|(?P<modify>\w*(?:chang|modif|reschedul|updat)\w*)"
+    r"|(?P<cancel>\w*cancel\w*)"
+    r")"
+)
+INTENT_REPLIES = {
+    "greet": "How can I help? Use the controls to check availability, book, modify, cancel, or view the menu.",
+    "avail": "Use 'Check availability' with guests and date to see available times.",
+    "book": "Use 'Book' with guests, date, time, and name to confirm a reservation.",
+    "modify": "Use 'Modify' with your reservation reference and the new details.",
+    "cancel": "Use 'Cancel' with your reservation reference.",
+}
 
 
 INDEX_HTML = """<!doctype html>
@@ -611,34 +746,35 @@ INDEX_HTML = """<!doctype html>
 </body>
 </html>
 """
+INDEX_HTML_BYTES = INDEX_HTML.encode("utf-8")
 
 
 @app.get("/", response_class=HTMLResponse)
-def home() -> HTMLResponse:
-    return HTMLResponse(INDEX_HTML)
+async def home() -> Response:
+    return Response(content=INDEX_HTML_BYTES, media_type="text/html")
 
 
 @app.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest) -> ChatResponse:
+async def chat(req: ChatRequest) -> ChatResponse:
     s = get_session(req.session_id)
     text = (req.message or "").strip().lower()
 
     # ---------- UI-FIRST ACTIONS ----------
     if req.action == "menu" or "menu" in text:
-        details = bool(req.menu_details) or any(k in text for k in ["details", "description", "ingredients"])
-        return ChatResponse(reply=menu_response(details))
+        details = bool(req.menu_details) or _MENU_DETAIL_RE.search(text) is not None
+        return _reply(menu_response(details))
 
     if req.action == "availability":
         d = parse_date_iso(req.date)
         g = req.guests
         if not d:
-            return ChatResponse(reply="Select a date to check availability.")
+            return _reply("Select a date to check availability.")
         if not g:
-            return ChatResponse(reply="Select number of guests to check availability.")
-        slots = engine.availability(d, g)
-        if not slots:
-            return ChatResponse(reply="No available times for the selected date and party size.", available_times=[])
-        return ChatResponse(reply="Available times shown.", available_times=[fmt_time(t) for t in slots])
+            return _reply("Select number of guests to check availability.")
+        labels = engine.availability_labels(d, g)
+        if not labels:
+            return _reply("No available times for the selected date and party size.", available_times=[])
+        return _reply("Available times shown.", available_times=labels)
 
     if req.action == "book":
         d = parse_date_iso(req.date)
@@ -648,32 +784,31 @@ def chat(req: ChatRequest) -> ChatResponse:
         phone = (req.phone or s.phone)
 
         if not name:
-            return ChatResponse(reply="Enter a name to place the reservation.")
+            return _reply("Enter a name to place the reservation.")
         if not d or not t or not g:
-            return ChatResponse(reply="Select guests, date, and time to book.")
+            return _reply("Select guests, date, and time to book.")
 
         try:
             r = engine.create(name=name, phone=phone, party_size=g, d=d, t=t)
         except ValueError:
-            slots = engine.availability(d, g)
-            return ChatResponse(
-                reply="That time is no longer available. Please choose another available time.",
-                available_times=[fmt_time(x) for x in slots],
+            return _reply(
+                "That time is no longer available. Please choose another available time.",
+                available_times=engine.availability_labels(d, g),
             )
 
         s.name = s.name or name
         s.phone = s.phone or phone
         s.last_reservation_id = r.reservation_id
 
-        return ChatResponse(reply=reservation_summary(r), active_reservation=serialize_reservation(r))
+        return _reply(reservation_summary(r), active_reservation=serialize_reservation(r))
 
     if req.action == "modify":
         rid = (req.reservation_id or s.last_reservation_id or "").strip().upper()
         if not rid:
-            return ChatResponse(reply="Provide a reservation reference to modify (e.g., R-XXXXXXXXXX).")
+            return _reply("Provide a reservation reference to modify (e.g., R-XXXXXXXXXX).")
         r0 = engine.get(rid)
         if not r0:
-            return ChatResponse(reply="Reservation not found. Check the reference and try again.")
+            return _reply("Reservation not found. Check the reference and try again.")
 
         d = parse_date_iso(req.date) or r0.reservation_date
         t = parse_time_hhmm(req.time) or r0.reservation_time
@@ -682,50 +817,39 @@ def chat(req: ChatRequest) -> ChatResponse:
         try:
             r = engine.modify(rid, party_size=g, d=d, t=t)
         except ValueError:
-            slots = engine.availability(d, g)
-            return ChatResponse(
-                reply="That update is not available. Please choose another available time.",
-                available_times=[fmt_time(x) for x in slots],
+            return _reply(
+                "That update is not available. Please choose another available time.",
+                available_times=engine.availability_labels(d, g),
             )
 
         s.last_reservation_id = r.reservation_id
-        return ChatResponse(
-            reply=reservation_summary(r, heading="Reservation updated."),
+        return _reply(
+            reservation_summary(r, heading="Reservation updated."),
             active_reservation=serialize_reservation(r),
         )
 
     if req.action == "cancel":
         rid = (req.reservation_id or s.last_reservation_id or "").strip().upper()
         if not rid:
-            return ChatResponse(reply="Provide a reservation reference to cancel (e.g., R-XXXXXXXXXX).")
+            return _reply("Provide a reservation reference to cancel (e.g., R-XXXXXXXXXX).")
         try:
             r = engine.cancel(rid)
         except KeyError:
-            return ChatResponse(reply="Reservation not found. Check the reference and try again.")
+            return _reply("Reservation not found. Check the reference and try again.")
 
         if s.last_reservation_id == rid:
             s.last_reservation_id = None
-        return ChatResponse(reply=f"Reservation cancelled.\n- Reference: {r.reservation_id}")
+        return _reply(f"Reservation cancelled.\n- Reference: {r.reservation_id}")
 
     # ---------- CHAT FALLBACK (kept strict + production-like) ----------
     # We do NOT pretend to answer everything outside reservations/menu.
-    if any(k in text for k in ["hi", "hello", "hey"]):
-        return ChatResponse(reply="How can I help? Use the controls to check availability, book, modify, cancel, or view the menu.")
-
-    if "available" in text or "availability" in text:
-        return ChatResponse(reply="Use 'Check availability' with guests and date to see available times.")
-
-    if any(k in text for k in ["book", "reserve", "reservation"]):
-        return ChatResponse(reply="Use 'Book' with guests, date, time, and name to confirm a reservation.")
-
-    if any(k in text for k in ["change", "modify", "reschedule", "update"]):
-        return ChatResponse(reply="Use 'Modify' with your reservation reference and the new details.")
-
-    if "cancel" in text:
-        return ChatResponse(reply="Use 'Cancel' with your reservation reference.")
+    found = {m.lastgroup for m in _INTENT_RE.finditer(text)}
+    for intent, reply in INTENT_REPLIES.items():
+        if intent in found:
+            return _reply(reply)
 
-    return ChatResponse(
-        reply="I can help with table availability, reservations (book/modify/cancel), or the menu. Please use the controls on the left."
+    return _reply(
+        "I can help with table availability, reservations (book/modify/cancel), or the menu. Please use the controls on the left."
     )
 
 
@@ -0,0 +1,87 @@
+import asyncio
+import unittest
+from datetime import date, time
+
+try:
+    import project
+except ImportError as exc:  # fastapi / pydantic / uvicorn not installed
+    raise unittest.SkipTest(f"project dependencies unavailable: {exc}")
+
+
+GENERIC = "I can help with table availability, reservations (book/modify/cancel), or the menu. Please use the controls on the left."
+
+# (message, expected reply). Non-greeting intents match their stem anywhere
+# in a word, as the original substring checks did; greetings must be whole
+# words, so "this" and "they" fall through to the generic reply.
+CHAT_FALLBACK_CASES = [
+    ("hello", project.INTENT_REPLIES["greet"]),
+    ("hey there", project.INTENT_REPLIES["greet"]),
+    ("this", GENERIC),
+    ("they", GENERIC),
+    ("is 7pm unavailable?", project.INTENT_REPLIES["avail"]),
+    ("check availability", project.INTENT_REPLIES["avail"]),
+    ("I reserved a table", project.INTENT_REPLIES["book"]),
+    ("bookings", project.INTENT_REPLIES["book"]),
+    ("changed my mind", project.INTENT_REPLIES["modify"]),
+    ("updated plans", project.INTENT_REPLIES["modify"]),
+    ("cancelling my table", project.INTENT_REPLIES["cancel"]),
+    ("precancel", project.INTENT_REPLIES["cancel"]),
+    ("rebook my table", project.INTENT_REPLIES["book"]),
+    ("prebooked", project.INTENT_REPLIES["book"]),
+    ("unchanged", project.INTENT_REPLIES["modify"]),
+    ("exchange seats", project.INTENT_REPLIES["modify"]),
+    ("cancel my booking", project.INTENT_REPLIES["book"]),
+    ("xyz", GENERIC),
+    ("menu", project.menu_response(False)),
+    ("menu detail please", project.menu_response(False)),
+    ("menu details", project.menu_response(True)),
+    ("menu with ingredients", project.menu_response(True)),
+]
+
+
+class ChatFallbackTest(unittest.TestCase):
+    def test_replies(self):
+        for message, expected in CHAT_FALLBACK_CASES:
+            with self.subTest(message=message):
+                req = project.ChatRequest(session_id="test", message=message)
+                self.assertEqual(asyncio.run(project.chat(req)).reply, expected)
+
+
+
+DAY = date(2026, 1, 1)
+
+
+class ReservationEngineTest(unittest.TestCase):
+    # Default schedule: 12:00-23:00, 30 min slots, 90 min turns (3 slots).
+    def setUp(self):
+        self.engine = project.ReservationEngine(project.RestaurantConfig(total_seats=4))
+
+    def test_fully_booked_slot_is_unavailable(self):
+        self.engine.create("A", None, 4, DAY, time(12, 0))
+        starts = self.engine.availability(DAY, 1)
+        # Any start whose turn overlaps 12:00-13:30 is blocked.
+        self.assertEqual(starts[0], time(13, 30))
+        with self.assertRaises(ValueError):
+            self.engine.create("B", None, 1, DAY, time(13, 0))
+
+    def test_modify_reuses_its_own_seats(self):
+        r = self.engine.create("A", None, 4, DAY, time(12, 0))
+        self.engine.modify(r.reservation_id, t=time(12, 30))
+        self.assertEqual(r.reservation_time, time(12, 30))
+        with self.assertRaises(ValueError):
+            self.engine.create("B", None, 1, DAY, time(12, 0))
+
+    def test_turn_must_end_inside_the_grid(self):
+        self.assertEqual(self.engine.availability(DAY, 1)[-1], time(20, 30))
+        with self.assertRaises(ValueError):
+            self.engine.create("A", None, 1, DAY, time(21, 0))
+
+    def test_availability_labels_refresh_after_cancel(self):
+        r = self.engine.create("A", None, 4, DAY, time(12, 0))
+        self.assertNotIn("12:00 PM", self.engine.availability_labels(DAY, 1))
+        self.engine.cancel(r.reservation_id)
+        self.assertIn("12:00 PM", self.engine.availability_labels(DAY, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()